@@ -5,25 +5,30 @@ With Indonesian localization and accessibility features
 """
 
 import streamlit as st
+import streamlit.components.v1 as components
 import sys
 from pathlib import Path
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime
 import json
-import io
 
 # Add src to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
 from src.transforms import (
     load_geo, 
-    load_features, 
+    load_geojson,
+    publish_geojson,
+    load_centroids,
+    has_province_geometry,
+    list_provinces,
+    year_bounds,
     build_province_month_df,
     compute_dominant_serotype,
-    SEROTYPE_PALETTE
+    SEROTYPE_PALETTE,
+    ALL_SEROTYPES
 )
 from src.charts import (
     create_serotype_stacked_area,
@@ -35,6 +40,157 @@ from src.forecast import (
 )
 from src.translations import get_text, get_province_name
 
+# Optional streaming JSON parser for large Auspice uploads
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Optional faster parser for the non-streaming fallback
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Serotype colors plus the gray used for provinces without data
+MAP_PALETTE = {**SEROTYPE_PALETTE, 'No Data': '#E0E0E0'}
+
+# Per-month columns joined onto the province attributes for the maps
+MONTH_COLUMNS = [
+    'cases', 'rainfall_mm', 'temperature_c', 'dominant_serotype',
+    'denv1_share', 'denv2_share', 'denv3_share', 'denv4_share'
+]
+
+# Placeholder values for a month with no rows after filtering
+EMPTY_MONTH_VALUES = {
+    'dominant_serotype': 'No Data',
+    'cases': 0,
+    'rainfall_mm': 0,
+    'temperature_c': 0,
+    **{f'denv{i}_share': 0 for i in range(1, 5)}
+}
+
+# Page styling, WCAG compliance, and accessibility helpers
+CUSTOM_CSS = """
+<style>
+.main-header {
+    font-size: 2.5rem;
+    font-weight: bold;
+    margin-bottom: 0.5rem;
+}
+.ksp-item {
+    color: white;
+    padding: 0.75rem 1.5rem;
+    border-radius: 25px;
+    font-weight: 500;
+    text-align: center;
+    display: block;
+    white-space: nowrap;
+    text-shadow: 0 1px 2px rgba(0,0,0,0.1);
+}
+.ksp-serotypes {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+}
+.ksp-climate {
+    background: linear-gradient(135deg, #06b6d4 0%, #0891b2 100%);
+}
+.ksp-forecast {
+    background: linear-gradient(135deg, #f59e0b 0%, #d97706 100%);
+}
+.status-badge {
+    display: inline-block;
+    padding: 0.25rem 0.75rem;
+    border-radius: 15px;
+    font-size: 0.9rem;
+    margin-right: 0.5rem;
+}
+.province-badge {
+    background-color: #E8F4F8;
+    color: #2C3E50;
+    border: 1px solid #BDC3C7;
+}
+.month-badge {
+    background-color: #FFF5E6;
+    color: #8B4513;
+    border: 1px solid #D2691E;
+}
+/* Accessibility improvements */
+.sr-only {
+    position: absolute;
+    width: 1px;
+    height: 1px;
+    padding: 0;
+    margin: -1px;
+    overflow: hidden;
+    clip: rect(0,0,0,0);
+    white-space: nowrap;
+    border: 0;
+}
+</style>
+"""
+
+# Sources & Ethics expander text per language
+SOURCES_MD = {
+    lang: (
+        f"### {get_text('data_sources', lang)}\n\n"
+        f"**{get_text('mock_data_notice', lang)}**\n\n"
+        f"{get_text('mock_data_desc', lang)}"
+    )
+    for lang in ('en', 'id')
+}
+
+# Display label -> key of the plain-text Auspice meta fields shown in the preview
+AUSPICE_META_KEYS = (('Title', 'title'), ('Updated', 'updated'))
+
+# Largest Auspice JSON the preview will parse
+MAX_AUSPICE_BYTES = 64 * 1024 * 1024
+
+# Planned phylogenetics pipeline text per language
+PHYLO_PIPELINE_MD = {
+    lang: (
+        f"### {get_text('phylo_pipeline', lang)}\n\n"
+        f"**{get_text('phylo_coming', lang)}**\n\n"
+        "1. **Sequence Alignment** (MAFFT)\n"
+        "2. **Quality Control** (Nextclade)\n"
+        "3. **Tree Construction** (IQ-TREE)\n"
+        "4. **Temporal Analysis** (TreeTime)\n"
+        "5. **Visualization** (Nextstrain/Auspice)"
+    )
+    for lang in ('en', 'id')
+}
+
+# Static serotype color legend, emitted as a single markdown element
+SEROTYPE_LEGEND_HTML = (
+    "<div style='display: flex; justify-content: space-around;'>"
+    + "".join(
+        f"<div style='text-align: center;' role='img' aria-label='{serotype} color indicator'>"
+        f"<span style='color: {color}; font-size: 24px;'>●</span><br>"
+        f"<b>{serotype}</b>"
+        f"</div>"
+        for serotype, color in SEROTYPE_PALETTE.items()
+    )
+    + "</div>"
+)
+
+# Integer codes for the choropleth's single-trace serotype coloring
+SEROTYPE_CODES = {serotype: i for i, serotype in enumerate(MAP_PALETTE)}
+
+# Default map view (all of Java) and the panel size the zoom is fitted to
+DEFAULT_MAP_CENTER = {"lat": -7.0, "lon": 109.5}
+DEFAULT_MAP_ZOOM = 5.5
+MAP_FIT_PX = 560
+MIN_MAP_SPAN_DEG = 1.5
+
+# Stepped colorscale: each code gets a flat band of its serotype color
+CHOROPLETH_COLORSCALE = [
+    [(i + edge) / len(MAP_PALETTE), color]
+    for i, color in enumerate(MAP_PALETTE.values())
+    for edge in (0, 1)
+]
+
 
 @st.cache_resource
 def get_fitted_model_params(df: pd.DataFrame):
@@ -42,131 +198,196 @@ def get_fitted_model_params(df: pd.DataFrame):
     return {"cached": True, "timestamp": datetime.now()}
 
 
+@st.cache_data(show_spinner=False)
+def province_names(lang='en'):
+    """
+    Localized display name for every province in the features data.
+    Cached per language.
+    
+    Returns:
+        Dict: province_id -> translated name
+    """
+    return {province_id: get_province_name(province_id, lang) for province_id in list_provinces()}
+
+
+def build_hover_text(merged, lang='en'):
+    """
+    Build the per-province hover HTML with vectorized string operations.
+    Provinces without data for the month get a short "No data" label.
+    """
+    cases_label = get_text('cases_unit', lang).capitalize()
+    rainfall_label = "Curah hujan" if lang == 'id' else "Rainfall"
+    temp_label = "Suhu" if lang == 'id' else "Temperature"
+    serotype_label = "Bagian Serotipe" if lang == 'id' else "Serotype Shares"
+    
+    def fmt(column, spec):
+        return merged[column].map(spec.format).to_numpy(dtype=str)
+    
+    names = merged['province_id'].map(province_names(lang)).to_numpy(dtype=str)
+    name_html = np.char.add(np.char.add('<b>', names), '</b><br>')
+    
+    # Alternating literal/value pieces, joined with numpy string ops
+    pieces = [
+        f"{cases_label}: ", fmt('cases', '{:,.0f}'),
+        f"<br>{rainfall_label}: ", fmt('rainfall_mm', '{:.1f}'),
+        f" mm<br>{temp_label}: ", fmt('temperature_c', '{:.1f}'),
+        f" °C<br><br><b>{serotype_label}:</b><br>DENV1: ", fmt('denv1_share', '{:.1%}'),
+        '<br>DENV2: ', fmt('denv2_share', '{:.1%}'),
+        '<br>DENV3: ', fmt('denv3_share', '{:.1%}'),
+        '<br>DENV4: ', fmt('denv4_share', '{:.1%}'),
+    ]
+    full_text = name_html
+    for piece in pieces:
+        full_text = np.char.add(full_text, piece)
+    
+    return pd.Series(
+        np.where(merged['cases'].notna(), full_text, np.char.add(name_html, 'No data')),
+        index=merged.index,
+        dtype=object
+    )
+
+
+def merge_month_data(df_month, gdf, selected_provinces):
+    """
+    Join one month of data onto the selected provinces, in GeoDataFrame order.
+    Provinces without a row for the month keep NaN values.
+    Geometry is left out: the maps take shapes from the cached GeoJSON.
+    """
+    # Attribute columns of the selected provinces as a plain DataFrame
+    gdf_filtered = pd.DataFrame(
+        gdf.loc[gdf.index.intersection(selected_provinces), gdf.columns.drop('geometry', errors='ignore')]
+    )
+    
+    # Align the month's values to the provinces by index instead of merging
+    if len(df_month) > 0:
+        month_values = df_month.set_index('province_id')[MONTH_COLUMNS].reindex(gdf_filtered.index)
+        merged = pd.concat([gdf_filtered, month_values], axis=1)
+    else:
+        merged = gdf_filtered.assign(**EMPTY_MONTH_VALUES)
+    
+    return merged
+
+
+def map_view(bounds):
+    """
+    Center and zoom that fit a lon/lat bounding box into the map panel,
+    like the old geo layout's fitbounds="locations".
+    
+    Args:
+        bounds: (min_lon, min_lat, max_lon, max_lat)
+        
+    Returns:
+        Tuple of (center dict, zoom); the default Java view if bounds are empty
+    """
+    min_lon, min_lat, max_lon, max_lat = bounds
+    if not np.all(np.isfinite(bounds)):
+        return DEFAULT_MAP_CENTER, DEFAULT_MAP_ZOOM
+    
+    center = {"lat": float(min_lat + max_lat) / 2, "lon": float(min_lon + max_lon) / 2}
+    # 20% padding; a floor keeps single provinces from zooming in too far
+    span = max((max_lon - min_lon) * 1.2, (max_lat - min_lat) * 1.2, MIN_MAP_SPAN_DEG)
+    # MapLibre tiles are 512px, so the world is 512 * 2**zoom px wide
+    zoom = float(np.log2(MAP_FIT_PX * 360 / (512 * span)))
+    return center, zoom
+
+
+@st.cache_resource(show_spinner=False)
+def empty_map_figure(lang='en'):
+    """
+    Placeholder map for a month with no rows after filtering.
+    Built once per language and shared, since it never changes.
+    """
+    fig = go.Figure()
+    fig.add_annotation(
+        text="Tidak ada data untuk filter yang dipilih" if lang == 'id' else "No data for selected filters",
+        showarrow=False,
+        font=dict(size=16, color="#666666")
+    )
+    fig.update_layout(
+        height=600,
+        xaxis_visible=False,
+        yaxis_visible=False,
+        paper_bgcolor='white',
+        plot_bgcolor='white'
+    )
+    return fig
+
+
+def choropleth_trace_data(merged, lang='en'):
+    """
+    Per-province color codes and hover text for the choropleth trace.
+    
+    Returns:
+        Tuple of (z codes array, customdata array of shape (n, 1))
+    """
+    z = merged['dominant_serotype'].map(SEROTYPE_CODES).fillna(SEROTYPE_CODES['No Data']).to_numpy()
+    customdata = build_hover_text(merged, lang).to_numpy().reshape(-1, 1)
+    return z, customdata
+
+
 def create_choropleth_map(df_month, gdf, selected_provinces, lang='en'):
     """
     Create a Plotly choropleth map colored by dominant serotype.
     Falls back to scatter map if GeoJSON not available.
+    
+    Serotypes are drawn as integer codes on a stepped colorscale, so the
+    figure is a single trace whose z/customdata can be restyled per month.
     """
-    # Check if we have geometry data
-    has_geometry = 'geometry' in gdf.columns and gdf['geometry'].notna().any()
+    if len(df_month) == 0:
+        return empty_map_figure(lang)
     
-    if not has_geometry:
+    # Check if we have geometry data
+    if not has_province_geometry():
         return create_simple_scatter_map(df_month, gdf, selected_provinces, lang)
     
-    # Filter GeoDataFrame to selected provinces
-    gdf_filtered = gdf[gdf['province_id'].isin(selected_provinces)].copy()
+    merged = merge_month_data(df_month, gdf, selected_provinces)
     
-    # Merge data with geometries
-    if len(df_month) > 0:
-        df_month = df_month.reset_index()
-        merged = gdf_filtered.merge(
-            df_month[['province_id', 'cases', 'rainfall_mm', 'temperature_c', 
-                     'dominant_serotype', 'denv1_share', 'denv2_share', 
-                     'denv3_share', 'denv4_share']],
-            on='province_id',
-            how='left'
-        )
-    else:
-        merged = gdf_filtered.copy()
-        merged['dominant_serotype'] = 'No Data'
-        merged['cases'] = 0
-        merged['rainfall_mm'] = 0
-        merged['temperature_c'] = 0
-        for i in range(1, 5):
-            merged[f'denv{i}_share'] = 0
-    
-    # Convert GeoDataFrame to GeoJSON for Plotly
+    # Reference the served GeoJSON by URL; embed the shapes if it isn't served
     try:
-        geojson_dict = json.loads(gdf_filtered.to_json())
+        geojson = publish_geojson() or load_geojson(selected_provinces)
     except:
         return create_simple_scatter_map(df_month, gdf, selected_provinces, lang)
     
-    # Create hover text with translations
-    cases_label = get_text('cases_unit', lang).capitalize()
-    rainfall_label = "Curah hujan" if lang == 'id' else "Rainfall"
-    temp_label = "Suhu" if lang == 'id' else "Temperature"
-    serotype_label = "Bagian Serotipe" if lang == 'id' else "Serotype Shares"
-    
-    merged['hover_text'] = merged.apply(
-        lambda row: (
-            f"<b>{get_province_name(row['province_id'], lang)}</b><br>"
-            f"{cases_label}: {row['cases']:,}<br>"
-            f"{rainfall_label}: {row['rainfall_mm']:.1f} mm<br>"
-            f"{temp_label}: {row['temperature_c']:.1f} °C<br>"
-            f"<br><b>{serotype_label}:</b><br>"
-            f"DENV1: {row['denv1_share']:.1%}<br>"
-            f"DENV2: {row['denv2_share']:.1%}<br>"
-            f"DENV3: {row['denv3_share']:.1%}<br>"
-            f"DENV4: {row['denv4_share']:.1%}"
-        ) if pd.notna(row['cases']) else f"<b>{get_province_name(row['province_id'], lang)}</b><br>No data",
-        axis=1
-    )
+    z, customdata = choropleth_trace_data(merged, lang)
+    legend_title = "Serotipe Dominan" if lang == 'id' else "Dominant Serotype"
     
-    # Create color mapping
-    color_discrete_map = SEROTYPE_PALETTE.copy()
-    color_discrete_map['No Data'] = '#E0E0E0'
-    
-    # Create the choropleth
-    fig = px.choropleth(
-        merged,
-        geojson=geojson_dict,
-        locations='province_id',
-        color='dominant_serotype',
-        color_discrete_map=color_discrete_map,
+    # Create the choropleth (MapLibre/WebGL rendering)
+    fig = go.Figure(go.Choroplethmap(
+        geojson=geojson,
+        locations=merged['province_id'],
         featureidkey="properties.province_id",
-        hover_name='province_name',
-        hover_data={
-            'province_id': False,
-            'dominant_serotype': False
-        },
-        labels={'dominant_serotype': 'Serotipe Dominan' if lang == 'id' else 'Dominant Serotype'},
-    )
-    
-    # Update traces to use custom hover text
-    fig.update_traces(
-        customdata=merged[['hover_text']].values,
-        hovertemplate='%{customdata[0]}<extra></extra>'
-    )
-    
-    # Update layout
-    fig.update_geos(
-        center={"lat": -7.0, "lon": 110.0},
-        projection_scale=8,
-        showcountries=True,
-        countrycolor="#CCCCCC",
-        showcoastlines=True,
-        coastlinecolor="#999999",
-        showland=True,
-        landcolor="#FAFAFA",
-        showocean=True,
-        oceancolor="#E8F4F8",
-        fitbounds="locations",
-        visible=True,
-        resolution=50,
-        scope="asia"
-    )
+        z=z,
+        zmin=-0.5,
+        zmax=len(SEROTYPE_CODES) - 0.5,
+        colorscale=CHOROPLETH_COLORSCALE,
+        customdata=customdata,
+        hovertemplate='%{customdata[0]}<extra></extra>',
+        marker_line_color='white',
+        marker_opacity=0.8,
+        colorbar=dict(
+            title=legend_title,
+            tickvals=list(SEROTYPE_CODES.values()),
+            ticktext=list(SEROTYPE_CODES.keys()),
+            len=0.5,
+            bgcolor="rgba(255,255,255,0.8)",
+            bordercolor="#CCCCCC",
+            borderwidth=1
+        )
+    ))
     
     title_text = "Serotipe Dominan Demam Berdarah per Provinsi" if lang == 'id' else "Dengue Dominant Serotype by Province"
     
+    # Fit the view to the selected provinces' shapes
+    center, zoom = map_view(gdf.loc[merged.index].total_bounds)
+    
     fig.update_layout(
         title=title_text,
         height=600,
         margin={"r": 0, "t": 40, "l": 0, "b": 0},
-        legend=dict(
-            title="Serotipe Dominan" if lang == 'id' else "Dominant Serotype",
-            orientation="v",
-            yanchor="middle",
-            y=0.5,
-            xanchor="left",
-            x=1.02,
-            bgcolor="rgba(255,255,255,0.8)",
-            bordercolor="#CCCCCC",
-            borderwidth=1
-        ),
-        geo=dict(
-            showframe=True,
-            showcoastlines=True,
-            projection_type='natural earth'
+        map=dict(
+            style="carto-positron",
+            center=center,
+            zoom=zoom
         ),
         paper_bgcolor='white',
         plot_bgcolor='white'
@@ -175,103 +396,735 @@ def create_choropleth_map(df_month, gdf, selected_provinces, lang='en'):
     return fig
 
 
+def get_session_choropleth(df_month, gdf, selected_provinces, lang='en'):
+    """
+    Return this session's choropleth with the month's data patched in.
+    
+    The base figure (geometry + layout) is built once per province selection
+    and language and kept in st.session_state; changing month only restyles
+    the trace's z and customdata arrays.
+    """
+    fig_key = (tuple(selected_provinces), lang)
+    fig = st.session_state.get('map_fig')
+    
+    if fig is None or st.session_state.get('map_fig_key') != fig_key:
+        fig = create_choropleth_map(df_month, gdf, selected_provinces, lang)
+        # Only a real choropleth can be restyled (not the scatter fallback)
+        if fig.data and fig.data[0].type == 'choroplethmap':
+            st.session_state['map_fig'] = fig
+            st.session_state['map_fig_key'] = fig_key
+        return fig
+    
+    merged = merge_month_data(df_month, gdf, selected_provinces)
+    z, customdata = choropleth_trace_data(merged, lang)
+    fig.update_traces(z=z, customdata=customdata)
+    return fig
+
+
 def create_simple_scatter_map(df_month, gdf, selected_provinces, lang='en'):
     """
     Create a simple scatter map as an alternative visualization.
     Uses circles at province centers colored by dominant serotype.
     """
-    # Filter GeoDataFrame to selected provinces
-    gdf_filtered = gdf[gdf['province_id'].isin(selected_provinces)].copy()
+    if len(df_month) == 0:
+        return empty_map_figure(lang)
     
-    # Merge data
-    if len(df_month) > 0:
-        df_month = df_month.reset_index()
-        merged = gdf_filtered.merge(
-            df_month[['province_id', 'cases', 'rainfall_mm', 'temperature_c', 
-                     'dominant_serotype', 'denv1_share', 'denv2_share', 
-                     'denv3_share', 'denv4_share']],
-            on='province_id',
-            how='left'
-        )
-    else:
-        merged = gdf_filtered.copy()
-        merged['dominant_serotype'] = 'No Data'
-        merged['cases'] = 0
-        merged['rainfall_mm'] = 0
-        merged['temperature_c'] = 0
+    merged = merge_month_data(df_month, gdf, selected_provinces)
+    hover_text = build_hover_text(merged, lang).to_numpy()
+    cases = merged['cases'].fillna(0).to_numpy()
     
-    # Create translated province names
-    merged['province_display'] = merged['province_id'].apply(lambda x: get_province_name(x, lang))
+    # Centroids come from the float32 lookup rather than the merged frame
+    positions, centroids = load_centroids()
+    lon_lat = centroids[[positions[p] for p in merged['province_id']]]
     
-    # Create hover text with translations
-    cases_label = get_text('cases_unit', lang).capitalize()
-    rainfall_label = "Curah hujan" if lang == 'id' else "Rainfall"
-    temp_label = "Suhu" if lang == 'id' else "Temperature"
-    serotype_label = "Bagian Serotipe" if lang == 'id' else "Serotype Shares"
+    title_text = "Kasus Demam Berdarah per Provinsi (Peta Gelembung)" if lang == 'id' else "Dengue Cases by Province (Bubble Map)"
+    legend_title = "Serotipe Dominan" if lang == 'id' else "Dominant Serotype"
     
-    merged['hover_text'] = merged.apply(
-        lambda row: (
-            f"<b>{row['province_display']}</b><br>"
-            f"{cases_label}: {row['cases']:,}<br>"
-            f"{rainfall_label}: {row['rainfall_mm']:.1f} mm<br>"
-            f"{temp_label}: {row['temperature_c']:.1f} °C<br>"
-            f"<br><b>{serotype_label}:</b><br>"
-            f"DENV1: {row.get('denv1_share', 0):.1%}<br>"
-            f"DENV2: {row.get('denv2_share', 0):.1%}<br>"
-            f"DENV3: {row.get('denv3_share', 0):.1%}<br>"
-            f"DENV4: {row.get('denv4_share', 0):.1%}"
-        ) if pd.notna(row['cases']) else f"<b>{row['province_display']}</b><br>No data",
-        axis=1
+    # Bubble area proportional to cases, largest bubble 50px across
+    sizeref = 2.0 * cases.max(initial=1) / (50 ** 2)
+    
+    # One trace per serotype present, so each gets a legend entry
+    serotypes = merged['dominant_serotype'].astype(object).fillna('No Data').to_numpy()
+    fig = go.Figure()
+    for serotype, color in MAP_PALETTE.items():
+        mask = serotypes == serotype
+        if not mask.any():
+            continue
+        fig.add_trace(go.Scattermap(
+            lon=lon_lat[mask, 0],
+            lat=lon_lat[mask, 1],
+            name=serotype,
+            customdata=hover_text[mask].reshape(-1, 1),
+            hovertemplate='%{customdata[0]}<extra></extra>',
+            marker=dict(
+                color=color,
+                size=cases[mask],
+                sizemode='area',
+                sizeref=sizeref,
+                sizemin=10,
+                opacity=0.85
+            )
+        ))
+    
+    # Fit the view to the plotted centroids (MapLibre/WebGL, same basemap as the choropleth)
+    center, zoom = map_view((*lon_lat.min(axis=0), *lon_lat.max(axis=0)) if len(lon_lat) else (np.nan,) * 4)
+    fig.update_layout(
+        title=title_text,
+        legend_title_text=legend_title,
+        height=600,
+        margin={"r": 0, "t": 40, "l": 0, "b": 0},
+        map=dict(
+            style="carto-positron",
+            center=center,
+            zoom=zoom
+        ),
+        paper_bgcolor='white',
+        plot_bgcolor='white'
     )
     
-    title_text = "Kasus Demam Berdarah per Provinsi (Peta Gelembung)" if lang == 'id' else "Dengue Cases by Province (Bubble Map)"
+    return fig
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def filtered_views(provinces, year_range, serotypes):
+    """
+    Data derived from one filter selection, built once per selection.
+    Keyed on the sorted filter values like run_forecast, so a cache hit
+    hashes three small tuples instead of the whole filtered frame.
+    Shared as a resource - treat the contents as read-only.
     
-    # Create scatter map
-    fig = px.scatter_geo(
-        merged,
-        lat='lat',
-        lon='lon',
-        color='dominant_serotype',
-        size='cases',
-        hover_name='province_display',
-        color_discrete_map=SEROTYPE_PALETTE,
-        size_max=50,
-        title=title_text
+    Returns:
+        Dict with:
+            months: DatetimeIndex of the months present, in date order
+            labels: '%B %Y' slider labels for those months
+            month_groups: {month: rows}, so the month slider does a dict
+                lookup rather than scanning the index
+            monthly_stats: total_cases/avg_rainfall/avg_temp per month
+            serotype_counts: dominant-serotype counts per month
+            csv: CSV bytes for the download button
+            recent_cases: case totals for each of the last 12 months
+    """
+    df_filtered = build_province_month_df(
+        province=list(provinces),
+        year_range=year_range,
+        serotypes=list(serotypes)
     )
     
-    # Update hover template
-    fig.update_traces(
-        customdata=merged[['hover_text']].values,
-        hovertemplate='%{customdata[0]}<extra></extra>',
-        marker=dict(
-            line=dict(width=1, color='white'),
-            sizemin=10
-        )
+    # Aggregate by month in a single groupby pass
+    monthly_stats = df_filtered.groupby(level=0).agg(
+        total_cases=('cases', 'sum'),
+        avg_rainfall=('rainfall_mm', 'mean'),
+        avg_temp=('temperature_c', 'mean')
     )
+    serotype_counts = (
+        df_filtered.groupby([df_filtered.index, 'dominant_serotype'], observed=True).size().unstack(fill_value=0)
+    )
+    
+    # Labels are formatted in one vectorized call
+    months = monthly_stats.index
     
-    # Focus on Indonesia
-    fig.update_geos(
-        center={"lat": -6.5, "lon": 107.0},
-        projection_scale=5,
-        showcountries=True,
-        countrycolor="#CCCCCC",
-        showcoastlines=True,
-        coastlinecolor="#999999",
-        showland=True,
-        landcolor="#FAFAFA",
-        showocean=True,
-        oceancolor="#E8F4F8",
-        fitbounds="locations"
+    return {
+        'months': months,
+        'labels': list(months.strftime('%B %Y')),
+        'month_groups': dict(iter(df_filtered.groupby(level=0))),
+        'monthly_stats': monthly_stats,
+        'serotype_counts': serotype_counts,
+        'csv': df_filtered.to_csv(index=True).encode('utf-8'),
+        'recent_cases': monthly_stats['total_cases'].tail(12).rename('cases').to_frame(),
+    }
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def run_forecast(provinces, year_range, serotypes, horizon_months, rainfall_lag):
+    """
+    Forecast and backtest for one filter selection.
+    Keyed on the filter values rather than the filtered frame, so reruns that
+    don't touch the filters or forecast controls skip the model fits.
+    
+    Returns:
+        Tuple of (forecast DataFrame, backtest metrics dict)
+    """
+    df_filtered = build_province_month_df(
+        province=list(provinces),
+        year_range=year_range,
+        serotypes=list(serotypes)
+    )
+    forecast_df = make_forecast(
+        df_filtered,
+        horizon_months=horizon_months,
+        rainfall_lag=rainfall_lag
     )
+    metrics = backtest_forecast(
+        df_filtered,
+        test_months=min(12, len(df_filtered) // 2),
+        rainfall_lag=rainfall_lag
+    )
+    return forecast_df, metrics
+
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+def build_bubble_map(df_month, selected_provinces, lang='en'):
+    """
+    Build the bubble map for one month of filtered data.
+    Cached as a shared resource, so revisiting a month on the slider reuses
+    the rendered figure instead of rebuilding it. Choropleths don't come
+    through here: get_session_choropleth restyles one figure per session.
+    """
+    return create_simple_scatter_map(df_month, load_geo(), list(selected_provinces), lang)
+
+
+@st.fragment
+def render_map_panel(filter_key, gdf, selected_provinces, map_type, lang='en', light_render=False):
+    """
+    Month slider, map, download button and monthly statistics.
+    Runs as a fragment, so moving the month slider reruns only this panel
+    instead of the whole page (filters, trends and forecast).
+    filter_key is the sorted (provinces, year_range, serotypes) selection.
+    """
+    views = filtered_views(*filter_key)
     
-    fig.update_layout(
-        height=600,
-        margin={"r": 0, "t": 40, "l": 0, "b": 0},
+    # Format months for display
+    available_months = views['months']
+    month_options = dict(enumerate(views['labels']))
+    
+    # Default to most recent month
+    default_index = len(month_options) - 1
+    
+    selected_month_index = st.select_slider(
+        get_text('select_month', lang),
+        options=list(month_options.keys()),
+        value=default_index,
+        format_func=lambda x: month_options[x],
+        help=get_text('select_month_help', lang)
+    )
+    
+    selected_month = available_months[selected_month_index]
+    
+    # Display selected month prominently
+    st.markdown(f"### {get_text('showing_data_for', lang)} **{month_options[selected_month_index]}**")
+    
+    # Get data for selected month
+    df_month = views['month_groups'][selected_month]
+    
+    # Download button for filtered data
+    col_map, col_download = st.columns([5, 1])
+    
+    with col_download:
+        # Prepare CSV for download (serialized once per filtered frame)
+        csv_data = views['csv']
+        
+        st.download_button(
+            label=get_text('download_data', lang),
+            data=csv_data,
+            file_name=f"genetropica_data_{selected_month.strftime('%Y%m')}.csv",
+            mime="text/csv",
+            help=get_text('download_help', lang)
+        )
+    
+    # Create two columns for map and stats
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        # Choropleth restyles the session's figure; bubble maps reuse cached figures
+        if map_type == "Choropleth" and has_province_geometry():
+            fig = get_session_choropleth(df_month, gdf, selected_provinces, lang)
+        else:
+            fig = build_bubble_map(df_month, tuple(selected_provinces), lang)
+        
+        if light_render:
+            map_html = fig.to_html(include_plotlyjs='cdn', full_html=False)
+            # st.iframe replaces components.html (deprecated) on newer Streamlit
+            if hasattr(st, 'iframe'):
+                st.iframe(map_html, height=620)
+            else:
+                components.html(map_html, height=620)
+        else:
+            st.plotly_chart(fig, use_container_width=True)
+        
+        # Accessibility caption
+        map_caption = ("Interactive map showing dengue serotype distribution across Indonesian provinces. "
+                     "Each province is colored by its dominant serotype." if lang == 'en' else
+                     "Peta interaktif menunjukkan distribusi serotipe demam berdarah di provinsi-provinsi Indonesia. "
+                     "Setiap provinsi diwarnai berdasarkan serotipe dominannya.")
+        st.caption(f"🗺️ {map_caption}")
+    
+    with col2:
+        # Display statistics for selected month
+        st.markdown(f"### {get_text('monthly_stats', lang)}")
+        
+        monthly_stats = views['monthly_stats']
+        serotype_counts_by_month = views['serotype_counts']
+        
+        if selected_month in monthly_stats.index:
+            total_cases = monthly_stats.at[selected_month, 'total_cases']
+            avg_rainfall = monthly_stats.at[selected_month, 'avg_rainfall']
+            avg_temp = monthly_stats.at[selected_month, 'avg_temp']
+            
+            st.metric(get_text('total_cases', lang), f"{total_cases:,}")
+            st.metric(get_text('avg_rainfall', lang), f"{avg_rainfall:.1f} mm")
+            st.metric(get_text('avg_temperature', lang), f"{avg_temp:.1f} °C")
+            
+            # Serotype distribution
+            st.markdown(f"#### {get_text('serotype_dist', lang)}")
+            serotype_counts = serotype_counts_by_month.loc[selected_month]
+            serotype_counts = serotype_counts[serotype_counts > 0].sort_values(ascending=False)
+            serotypes = serotype_counts.index.astype(str).to_series(index=serotype_counts.index)
+            colors = serotypes.map(SEROTYPE_PALETTE).fillna('#888')
+            lines = (
+                "<span style='color: " + colors + "'>●</span> **" + serotypes + "**: "
+                + serotype_counts.astype(str) + f" {get_text('provinces_unit', lang)}"
+            )
+            st.markdown("  \n".join(lines), unsafe_allow_html=True)
+        else:
+            st.info("No data for selected filters" if lang == 'en' else "Tidak ada data untuk filter yang dipilih")
+
+
+@st.fragment
+def render_trends_panel(df_filtered, lang='en'):
+    """
+    Serotype composition and cases-vs-climate charts with their controls.
+    Runs as a fragment, so the smoothing and lag controls rerun only this panel.
+    """
+    # Trends and Climate Analysis Section
+    st.markdown("---")
+    st.header(get_text('trends_header', lang))
+    
+    # Add smoothing option and lag slider in columns
+    control_col1, control_col2, control_col3 = st.columns([1, 1, 2])
+    
+    with control_col1:
+        smooth_data = st.checkbox(
+            get_text('smooth_data', lang), 
+            value=False,
+            help=get_text('smooth_help', lang)
+        )
+    
+    with control_col2:
+        lag_months = st.slider(
+            get_text('rainfall_lag', lang),
+            min_value=0, 
+            max_value=3, 
+            value=0,
+            help=get_text('rainfall_lag_help', lang)
+        )
+    
+    # Two column layout for charts
+    chart_col1, chart_col2 = st.columns(2)
+    
+    with chart_col1:
+        st.subheader(get_text('serotype_comp', lang))
+        
+        # Create stacked area chart
+        fig_serotype = create_serotype_stacked_area(
+            df_filtered,
+            SEROTYPE_PALETTE,
+            smooth=smooth_data,
+            window=3
+        )
+        st.plotly_chart(fig_serotype, use_container_width=True)
+        
+        # Validation note with accessibility
+        st.caption(get_text('stacked_note', lang))
+    
+    with chart_col2:
+        st.subheader(get_text('cases_climate', lang))
+        
+        # Create dual-axis chart
+        fig_climate, rainfall_corr, temp_corr = create_cases_climate_dual_axis(
+            df_filtered,
+            lag_months=lag_months
+        )
+        st.plotly_chart(fig_climate, use_container_width=True)
+        
+        # Display correlations
+        st.caption(get_text('correlations', lang))
+        corr_col1, corr_col2 = st.columns(2)
+        with corr_col1:
+            rainfall_text = "Curah hujan" if lang == 'id' else "Rainfall"
+            corr_text = f"{rainfall_text} (lag {lag_months}mo): **{rainfall_corr:.3f}**" if not pd.isna(rainfall_corr) else f"{rainfall_text}: No data"
+            st.caption(f"💧 {corr_text}")
+        with corr_col2:
+            temp_text = "Suhu" if lang == 'id' else "Temperature"
+            temp_corr_text = f"{temp_text}: **{temp_corr:.3f}**" if not pd.isna(temp_corr) else f"{temp_text}: No data"
+            st.caption(f"🌡️ {temp_corr_text}")
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def create_forecast_figure(last_12_months, forecast_df, lang='en'):
+    """
+    Build the forecast chart: recent actual cases, forecast line and 95% band.
+    Cached as a shared resource, so reruns with the same forecast reuse the figure.
+    """
+    fig_forecast = go.Figure()
+    
+    actual_dates = last_12_months.index
+    actual_cases = last_12_months['cases'].to_numpy()
+    
+    # Add actual cases
+    actual_label = "Kasus Aktual" if lang == 'id' else "Actual Cases"
+    fig_forecast.add_trace(go.Scatter(
+        x=actual_dates,
+        y=actual_cases,
+        mode='lines+markers',
+        name=actual_label,
+        line=dict(color='#2E86AB', width=2),
+        marker=dict(size=6)
+    ))
+    
+    # Add forecast with confidence interval
+    if len(forecast_df) > 0:
+        dates = forecast_df['date'].to_numpy()
+        yhat = forecast_df['yhat'].to_numpy()
+        
+        # Add forecast line
+        forecast_label = "Prakiraan" if lang == 'id' else "Forecast"
+        fig_forecast.add_trace(go.Scatter(
+            x=dates,
+            y=yhat,
+            mode='lines+markers',
+            name=forecast_label,
+            line=dict(color='#A23B72', width=2, dash='dash'),
+            marker=dict(size=6)
+        ))
+        
+        # Add confidence interval
+        x_area = np.concatenate([dates, dates[::-1]])
+        y_area = np.concatenate([
+            forecast_df['yhat_upper'].to_numpy(),
+            forecast_df['yhat_lower'].to_numpy()[::-1]
+        ])
+        
+        interval_label = "Interval Kepercayaan 95%" if lang == 'id' else "95% Confidence Interval"
+        fig_forecast.add_trace(go.Scatter(
+            x=x_area,
+            y=y_area,
+            fill='toself',
+            fillcolor='rgba(162, 59, 114, 0.2)',
+            line=dict(color='rgba(162, 59, 114, 0)'),
+            name=interval_label,
+            showlegend=True,
+            hoverinfo='skip'
+        ))
+        
+        # Connect actual to forecast with a dotted line
+        if len(actual_cases) > 0:
+            fig_forecast.add_trace(go.Scatter(
+                x=[actual_dates[-1], dates[0]],
+                y=[actual_cases[-1], yhat[0]],
+                mode='lines',
+                line=dict(color='gray', width=1, dash='dot'),
+                showlegend=False,
+                hoverinfo='skip'
+            ))
+    
+    # Update layout
+    title_text = "Prakiraan Kasus Demam Berdarah" if lang == 'id' else "Dengue Cases Forecast"
+    fig_forecast.update_layout(
+        title=title_text,
+        xaxis_title="Tanggal" if lang == 'id' else "Date",
+        yaxis_title="Kasus" if lang == 'id' else "Cases",
+        hovermode='x unified',
+        showlegend=True,
+        height=400,
+        plot_bgcolor='white',
         paper_bgcolor='white',
-        plot_bgcolor='white'
+        xaxis=dict(
+            gridcolor='#E0E0E0',
+            showgrid=True,
+            zeroline=False
+        ),
+        yaxis=dict(
+            gridcolor='#E0E0E0',
+            showgrid=True,
+            zeroline=False
+        )
     )
     
-    return fig
+    return fig_forecast
+
+
+@st.fragment
+def render_forecast_panel(filter_key, lang='en'):
+    """
+    Forecast chart, backtest metrics and their controls.
+    Runs as a fragment, so the horizon and lag controls rerun only this panel.
+    filter_key is the sorted (provinces, year_range, serotypes) selection.
+    """
+    # Forecast Section
+    st.markdown("---")
+    st.header(get_text('forecast_header', lang))
+    
+    # Disclaimer
+    st.warning(f"""
+    {get_text('forecast_warning', lang)}
+    
+    {get_text('forecast_disclaimer', lang)}
+    """)
+    
+    # Forecast controls
+    forecast_col1, forecast_col2, forecast_col3 = st.columns([1, 1, 2])
+    
+    with forecast_col1:
+        forecast_horizon = st.slider(
+            get_text('forecast_horizon', lang),
+            min_value=1,
+            max_value=3,
+            value=2,
+            help=get_text('forecast_horizon_help', lang)
+        )
+    
+    with forecast_col2:
+        forecast_lag = st.selectbox(
+            get_text('forecast_lag', lang),
+            options=[1, 2],
+            help=get_text('forecast_lag_help', lang)
+        )
+    
+    # Generate forecast with caching
+    try:
+        # Get forecast and backtest metrics (cached per filter selection)
+        forecast_df, metrics = run_forecast(*filter_key, forecast_horizon, forecast_lag)
+        
+        # Prepare data for visualization
+        last_12_months = filtered_views(*filter_key)['recent_cases']
+        
+        # Create forecast visualization (cached per forecast result)
+        fig_forecast = create_forecast_figure(last_12_months, forecast_df, lang)
+        
+        # Display forecast chart
+        st.plotly_chart(fig_forecast, use_container_width=True)
+        
+        # Accessibility caption for forecast
+        forecast_caption = ("Time series chart showing historical dengue cases and forecasted values with confidence intervals." if lang == 'en' else
+                          "Grafik seri waktu menunjukkan kasus demam berdarah historis dan nilai prakiraan dengan interval kepercayaan.")
+        st.caption(f"📈 {forecast_caption}")
+        
+        # Display metrics
+        col_metric1, col_metric2, col_metric3 = st.columns(3)
+        
+        with col_metric1:
+            mae_val = metrics.get('mae', np.nan)
+            if not pd.isna(mae_val):
+                st.metric(get_text('mae_backtest', lang), f"{mae_val:.1f} {get_text('cases_unit', lang)}")
+            else:
+                st.metric(get_text('mae_backtest', lang), get_text('insufficient_data', lang))
+        
+        with col_metric2:
+            rmse_val = metrics.get('rmse', np.nan)
+            if not pd.isna(rmse_val):
+                st.metric(get_text('rmse_backtest', lang), f"{rmse_val:.1f} {get_text('cases_unit', lang)}")
+            else:
+                st.metric(get_text('rmse_backtest', lang), get_text('insufficient_data', lang))
+        
+        with col_metric3:
+            n_tests = metrics.get('n_tests', 0)
+            st.metric(get_text('backtest_samples', lang), f"{n_tests} {get_text('months_unit', lang)}")
+        
+        # Model description
+        if len(forecast_df) > 0:
+            st.info(f"**{get_text('model_label', lang)}** {forecast_df.iloc[0]['model_notes']}")
+        
+    except Exception as e:
+        st.error(f"{get_text('error_forecast', lang)}: {str(e)}")
+        st.info(get_text('limited_data_msg', lang))
+
+
+@st.fragment
+def render_phylo_panel(lang='en'):
+    """
+    Phylogenetics expander with the Auspice JSON preview.
+    Runs as a fragment, so an upload reruns only this panel.
+    """
+    # Phylogenetics Section
+    st.markdown("---")
+    with st.expander(get_text('phylo_header', lang)):
+        col_phylo1, col_phylo2 = st.columns([1, 2])
+        
+        with col_phylo1:
+            # Display placeholder image (Streamlit loads the file itself)
+            phylo_img_path = Path(__file__).parent.parent / "assets" / "phylo_placeholder.png"
+            if phylo_img_path.exists():
+                caption_text = "Visualisasi Pohon Filogenetik (Placeholder)" if lang == 'id' else "Phylogenetic Tree Visualization (Placeholder)"
+                st.image(str(phylo_img_path), caption=caption_text, width='stretch')
+            else:
+                st.info("Phylogenetic tree visualization will appear here" if lang == 'en' else 
+                       "Visualisasi pohon filogenetik akan muncul di sini")
+        
+        with col_phylo2:
+            st.markdown(PHYLO_PIPELINE_MD[lang])
+        
+        st.markdown("---")
+        
+        # Auspice JSON uploader
+        st.markdown(f"### {get_text('auspice_preview', lang)}")
+        st.markdown(get_text('auspice_desc', lang))
+        
+        uploaded_file = st.file_uploader(
+            get_text('choose_file', lang),
+            type=['json'],
+            key='auspice_upload',
+            help="Upload a Nextstrain Auspice JSON for basic metadata preview"
+        )
+        
+        if uploaded_file is not None and uploaded_file.size > MAX_AUSPICE_BYTES:
+            max_mb = MAX_AUSPICE_BYTES // (1024 * 1024)
+            st.error(f"File too large (max {max_mb} MB)" if lang == 'en' else
+                     f"File terlalu besar (maks {max_mb} MB)")
+        elif uploaded_file is not None:
+            try:
+                metadata = preview_auspice(uploaded_file.file_id, uploaded_file)
+                
+                st.success(get_text('file_uploaded', lang))
+                
+                # Display metadata
+                if metadata:
+                    st.markdown(
+                        f"**{get_text('file_metadata', lang)}**\n\n"
+                        + "\n".join(f"- {key}: {value}" for key, value in metadata.items())
+                    )
+                
+            except ValueError:
+                st.error("Invalid JSON file" if lang == 'en' else "File JSON tidak valid")
+            except Exception as e:
+                st.error(f"Error: {str(e)}")
+
+
+def tree_stats(root):
+    """
+    Count the nodes, tips and maximum depth of an Auspice tree in one walk.
+    Walks an explicit stack, so deep trees can't hit the recursion limit.
+    
+    Returns:
+        Tuple: (total nodes, tips, max depth), with the root at depth 0
+        
+    Raises:
+        ValueError: If a node is not an object or its children not an array
+    """
+    count = tips = max_depth = 0
+    stack = [(root, 0)]
+    while stack:
+        node, depth = stack.pop()
+        if not isinstance(node, dict):
+            raise ValueError("Expected an object for every tree node")
+        count += 1
+        if depth > max_depth:
+            max_depth = depth
+        children = node.get('children', [])
+        if not isinstance(children, list):
+            raise ValueError("Expected an array for tree node children")
+        if children:
+            stack.extend((child, depth + 1) for child in children)
+        else:
+            tips += 1
+    return count, tips, max_depth
+
+
+def is_tree_node_prefix(prefix):
+    """
+    Whether an ijson prefix points at an Auspice tree node:
+    'tree' followed by zero or more '.children.item' segments.
+    """
+    return prefix == 'tree' + '.children.item' * prefix.count('.children.item')
+
+
+def read_auspice_metadata(file):
+    """
+    Extract preview metadata from an uploaded Auspice JSON.
+    Streams the file with ijson when it is installed, so the tree is counted
+    without being held in memory; otherwise loads it whole with orjson (or
+    json if orjson is missing).
+    
+    Args:
+        file: Binary file-like object (e.g. a Streamlit UploadedFile)
+        
+    Returns:
+        Dict: Display label -> value for the metadata found in the file
+        
+    Raises:
+        ValueError: If the file is not valid JSON or not shaped like an
+            Auspice JSON (document, meta and tree nodes must be objects)
+    """
+    meta = {}
+    panels = []
+    annotations = []
+    total_nodes = internal_nodes = max_depth = 0
+    
+    if IJSON_AVAILABLE:
+        try:
+            meta_prefixes = {f'meta.{key}': key for _, key in AUSPICE_META_KEYS}
+            last_event = None
+            for prefix, event, value in ijson.parse(file):
+                if event in ('map_key', 'end_map', 'end_array'):
+                    if prefix == 'meta.genome_annotations' and event == 'map_key':
+                        annotations.append(value)
+                elif prefix in ('', 'meta') or (prefix.endswith(('tree', '.children.item'))
+                                                 and is_tree_node_prefix(prefix)):
+                    # The document, meta and every tree node must be objects
+                    if event != 'start_map':
+                        raise ValueError(f"Expected an object at '{prefix or '<root>'}'")
+                    if prefix.startswith('tree'):
+                        total_nodes += 1
+                        # The first child of a node directly follows its children array
+                        if last_event == 'start_array':
+                            internal_nodes += 1
+                        max_depth = max(max_depth, prefix.count('.children.item'))
+                elif prefix.endswith('.children') and is_tree_node_prefix(prefix[:-len('.children')]):
+                    if event != 'start_array':
+                        raise ValueError(f"Expected an array at '{prefix}'")
+                elif event == 'string' and prefix in meta_prefixes:
+                    meta[meta_prefixes[prefix]] = value
+                elif event == 'string' and prefix == 'meta.panels.item':
+                    panels.append(value)
+                last_event = event
+        except ijson.JSONError as e:
+            raise ValueError(str(e)) from e
+    else:
+        json_content = orjson.loads(file.read()) if ORJSON_AVAILABLE else json.load(file)
+        if not isinstance(json_content, dict):
+            raise ValueError("Expected an object at '<root>'")
+        meta = json_content.get('meta', {})
+        if not isinstance(meta, dict):
+            raise ValueError("Expected an object at 'meta'")
+        # Keep only the value types the streaming parser picks up
+        panels = meta.get('panels')
+        panels = [panel for panel in panels if isinstance(panel, str)] if isinstance(panels, list) else []
+        annotations = meta.get('genome_annotations')
+        annotations = list(annotations) if isinstance(annotations, dict) else []
+        if 'tree' in json_content:
+            total_nodes, tips, max_depth = tree_stats(json_content['tree'])
+            internal_nodes = total_nodes - tips
+    
+    metadata = {
+        label: meta[key] for label, key in AUSPICE_META_KEYS
+        if isinstance(meta.get(key), str) and meta[key]
+    }
+    if panels:
+        metadata['Panels'] = ', '.join(panels)
+    if annotations:
+        metadata['Genome annotations'] = ', '.join(annotations)
+    if total_nodes:
+        metadata['Total nodes'] = total_nodes
+        metadata['Tips'] = total_nodes - internal_nodes
+        metadata['Max depth'] = max_depth
+    return metadata
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def preview_auspice(file_id, _file):
+    """
+    Read the preview metadata of an uploaded Auspice JSON.
+    Cached on the upload's file_id, so reruns with the same upload skip the
+    parse without hashing the file contents again.
+    
+    Args:
+        file_id: Streamlit's id for the upload
+        _file: The UploadedFile itself (not hashed)
+        
+    Returns:
+        Dict: Display label -> value, as from read_auspice_metadata
+    """
+    _file.seek(0)
+    return read_auspice_metadata(_file)
 
 
 def main():
@@ -293,63 +1146,7 @@ def main():
     lang = st.session_state.language
     
     # Custom CSS for better styling, WCAG compliance, and accessibility
-    st.markdown(f"""
-    <style>
-    .main-header {{
-        font-size: 2.5rem;
-        font-weight: bold;
-        margin-bottom: 0.5rem;
-    }}
-    .ksp-item {{
-        color: white;
-        padding: 0.75rem 1.5rem;
-        border-radius: 25px;
-        font-weight: 500;
-        text-align: center;
-        display: block;
-        white-space: nowrap;
-        text-shadow: 0 1px 2px rgba(0,0,0,0.1);
-    }}
-    .ksp-serotypes {{
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-    }}
-    .ksp-climate {{
-        background: linear-gradient(135deg, #06b6d4 0%, #0891b2 100%);
-    }}
-    .ksp-forecast {{
-        background: linear-gradient(135deg, #f59e0b 0%, #d97706 100%);
-    }}
-    .status-badge {{
-        display: inline-block;
-        padding: 0.25rem 0.75rem;
-        border-radius: 15px;
-        font-size: 0.9rem;
-        margin-right: 0.5rem;
-    }}
-    .province-badge {{
-        background-color: #E8F4F8;
-        color: #2C3E50;
-        border: 1px solid #BDC3C7;
-    }}
-    .month-badge {{
-        background-color: #FFF5E6;
-        color: #8B4513;
-        border: 1px solid #D2691E;
-    }}
-    /* Accessibility improvements */
-    .sr-only {{
-        position: absolute;
-        width: 1px;
-        height: 1px;
-        padding: 0;
-        margin: -1px;
-        overflow: hidden;
-        clip: rect(0,0,0,0);
-        white-space: nowrap;
-        border: 0;
-    }}
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
     
     # Main title with translation
     st.markdown(f'<h1 class="main-header" role="heading" aria-level="1">{get_text("app_title", lang)}</h1>', 
@@ -376,12 +1173,8 @@ def main():
     try:
         with st.spinner('Loading data...' if lang == 'en' else 'Memuat data...'):
             gdf = load_geo()
-            df = load_features()
-        
-        # Get date range from data
-        min_year = df.index.year.min()
-        max_year = df.index.year.max()
-        available_months = df.index.unique().sort_values()
+            # Get date range from data
+            min_year, max_year = year_bounds()
         
     except Exception as e:
         st.error(f"{get_text('error_loading', lang)}: {e}")
@@ -418,22 +1211,21 @@ def main():
         )
         
         # Province multiselect
-        all_provinces = sorted(df['province_id'].unique())
+        all_provinces = list_provinces()
         
         selected_provinces = st.multiselect(
             get_text('provinces', lang),
             options=all_provinces,
             default=all_provinces,
-            format_func=lambda x: get_province_name(x, lang),
+            format_func=province_names(lang).__getitem__,
             help=get_text('provinces_help', lang)
         )
         
         # Serotype multiselect
-        all_serotypes = ['DENV1', 'DENV2', 'DENV3', 'DENV4']
         selected_serotypes = st.multiselect(
             get_text('serotypes', lang),
-            options=all_serotypes,
-            default=all_serotypes,
+            options=ALL_SEROTYPES,
+            default=ALL_SEROTYPES,
             help=get_text('serotypes_help', lang)
         )
         
@@ -448,27 +1240,31 @@ def main():
             help=get_text('map_type_help', lang)
         )
         
+        # Raw HTML embed skips Streamlit's Plotly transport (no chart toolbar)
+        light_render = st.checkbox(
+            "Lightweight map rendering" if lang == 'en' else "Render peta ringan",
+            value=False,
+            help=("Embed the map as plain HTML for faster updates" if lang == 'en' else
+                  "Sematkan peta sebagai HTML biasa untuk pembaruan lebih cepat")
+        )
+        
         st.divider()
         
         # Sources & Ethics section
         with st.expander(get_text('sources_ethics', lang)):
-            st.markdown(f"""
-            ### {get_text('data_sources', lang)}
-            
-            **{get_text('mock_data_notice', lang)}**
-            
-            {get_text('mock_data_desc', lang)}
-            """)
+            st.markdown(SOURCES_MD[lang])
         
         st.divider()
         st.caption("Data filters update visualizations in real-time" if lang == 'en' else "Filter data memperbarui visualisasi secara real-time")
     
     # Filter data based on selections
     if selected_provinces and selected_serotypes:
+        # Sorted so the cache keys don't depend on selection order
+        filter_key = (tuple(sorted(selected_provinces)), tuple(year_range), tuple(sorted(selected_serotypes)))
         df_filtered = build_province_month_df(
-            province=selected_provinces,
-            year_range=year_range,
-            serotypes=selected_serotypes
+            province=list(filter_key[0]),
+            year_range=filter_key[1],
+            serotypes=list(filter_key[2])
         )
         
         if len(df_filtered) == 0:
@@ -476,7 +1272,7 @@ def main():
             return
             
         # Get available months after filtering
-        available_months_filtered = df_filtered.index.unique().sort_values()
+        available_months_filtered = filtered_views(*filter_key)['months']
         
         # Helper badges showing current selection
         provinces_text = f"{len(selected_provinces)} {get_text('provinces_selected' if len(selected_provinces) != 1 else 'province_selected', lang)}"
@@ -494,420 +1290,18 @@ def main():
         
         # Month selector (slider for animation)
         if len(available_months_filtered) > 0:
-            # Format months for display
-            month_options = {
-                i: month.strftime('%B %Y') 
-                for i, month in enumerate(available_months_filtered)
-            }
-            
-            # Default to most recent month
-            default_index = len(month_options) - 1
-            
-            selected_month_index = st.select_slider(
-                get_text('select_month', lang),
-                options=list(month_options.keys()),
-                value=default_index,
-                format_func=lambda x: month_options[x],
-                help=get_text('select_month_help', lang)
-            )
-            
-            selected_month = available_months_filtered[selected_month_index]
-            
-            # Display selected month prominently
-            st.markdown(f"### {get_text('showing_data_for', lang)} **{selected_month.strftime('%B %Y')}**")
-            
-            # Get data for selected month
-            df_month = df_filtered[df_filtered.index == selected_month]
-            
-            # Download button for filtered data
-            col_map, col_download = st.columns([5, 1])
-            
-            with col_download:
-                # Prepare CSV for download
-                csv_buffer = io.StringIO()
-                df_filtered.to_csv(csv_buffer, index=True)
-                csv_data = csv_buffer.getvalue()
-                
-                st.download_button(
-                    label=get_text('download_data', lang),
-                    data=csv_data,
-                    file_name=f"genetropica_data_{selected_month.strftime('%Y%m')}.csv",
-                    mime="text/csv",
-                    help=get_text('download_help', lang)
-                )
-            
-            # Create two columns for map and stats
-            col1, col2 = st.columns([3, 1])
-            
-            with col1:
-                # Create and display the map based on selection
-                if map_type == "Bubble Map":
-                    fig = create_simple_scatter_map(df_month, gdf, selected_provinces, lang)
-                else:
-                    fig = create_choropleth_map(df_month, gdf, selected_provinces, lang)
-                
-                st.plotly_chart(fig, use_container_width=True)
-                
-                # Accessibility caption
-                map_caption = ("Interactive map showing dengue serotype distribution across Indonesian provinces. "
-                             "Each province is colored by its dominant serotype." if lang == 'en' else
-                             "Peta interaktif menunjukkan distribusi serotipe demam berdarah di provinsi-provinsi Indonesia. "
-                             "Setiap provinsi diwarnai berdasarkan serotipe dominannya.")
-                st.caption(f"🗺️ {map_caption}")
-            
-            with col2:
-                # Display statistics for selected month
-                st.markdown(f"### {get_text('monthly_stats', lang)}")
-                
-                if len(df_month) > 0:
-                    total_cases = df_month['cases'].sum()
-                    avg_rainfall = df_month['rainfall_mm'].mean()
-                    avg_temp = df_month['temperature_c'].mean()
-                    
-                    st.metric(get_text('total_cases', lang), f"{total_cases:,}")
-                    st.metric(get_text('avg_rainfall', lang), f"{avg_rainfall:.1f} mm")
-                    st.metric(get_text('avg_temperature', lang), f"{avg_temp:.1f} °C")
-                    
-                    # Serotype distribution
-                    st.markdown(f"#### {get_text('serotype_dist', lang)}")
-                    serotype_counts = df_month['dominant_serotype'].value_counts()
-                    for serotype, count in serotype_counts.items():
-                        color = SEROTYPE_PALETTE.get(serotype, '#888')
-                        st.markdown(
-                            f"<span style='color: {color}'>●</span> **{serotype}**: {count} {get_text('provinces_unit', lang)}",
-                            unsafe_allow_html=True
-                        )
-                else:
-                    st.info("No data for selected filters" if lang == 'en' else "Tidak ada data untuk filter yang dipilih")
+            render_map_panel(filter_key, gdf, selected_provinces, map_type, lang, light_render)
             
             # Legend for serotype colors with WCAG compliant colors
             st.markdown("---")
             st.markdown(f"### 🎨 {'Serotype Color Legend' if lang == 'en' else 'Legenda Warna Serotipe'}")
-            legend_cols = st.columns(4)
-            for i, (serotype, color) in enumerate(SEROTYPE_PALETTE.items()):
-                with legend_cols[i]:
-                    st.markdown(
-                        f"<div style='text-align: center;' role='img' aria-label='{serotype} color indicator'>"
-                        f"<span style='color: {color}; font-size: 24px;'>●</span><br>"
-                        f"<b>{serotype}</b>"
-                        f"</div>",
-                        unsafe_allow_html=True
-                    )
-            
-            # Trends and Climate Analysis Section
-            st.markdown("---")
-            st.header(get_text('trends_header', lang))
-            
-            # Add smoothing option and lag slider in columns
-            control_col1, control_col2, control_col3 = st.columns([1, 1, 2])
-            
-            with control_col1:
-                smooth_data = st.checkbox(
-                    get_text('smooth_data', lang), 
-                    value=False,
-                    help=get_text('smooth_help', lang)
-                )
-            
-            with control_col2:
-                lag_months = st.slider(
-                    get_text('rainfall_lag', lang),
-                    min_value=0, 
-                    max_value=3, 
-                    value=0,
-                    help=get_text('rainfall_lag_help', lang)
-                )
-            
-            # Two column layout for charts
-            chart_col1, chart_col2 = st.columns(2)
-            
-            with chart_col1:
-                st.subheader(get_text('serotype_comp', lang))
-                
-                # Create stacked area chart
-                fig_serotype = create_serotype_stacked_area(
-                    df_filtered,
-                    SEROTYPE_PALETTE,
-                    smooth=smooth_data,
-                    window=3
-                )
-                st.plotly_chart(fig_serotype, use_container_width=True)
-                
-                # Validation note with accessibility
-                st.caption(get_text('stacked_note', lang))
-            
-            with chart_col2:
-                st.subheader(get_text('cases_climate', lang))
-                
-                # Create dual-axis chart
-                fig_climate, rainfall_corr, temp_corr = create_cases_climate_dual_axis(
-                    df_filtered,
-                    lag_months=lag_months
-                )
-                st.plotly_chart(fig_climate, use_container_width=True)
-                
-                # Display correlations
-                st.caption(get_text('correlations', lang))
-                corr_col1, corr_col2 = st.columns(2)
-                with corr_col1:
-                    rainfall_text = "Curah hujan" if lang == 'id' else "Rainfall"
-                    corr_text = f"{rainfall_text} (lag {lag_months}mo): **{rainfall_corr:.3f}**" if not pd.isna(rainfall_corr) else f"{rainfall_text}: No data"
-                    st.caption(f"💧 {corr_text}")
-                with corr_col2:
-                    temp_text = "Suhu" if lang == 'id' else "Temperature"
-                    temp_corr_text = f"{temp_text}: **{temp_corr:.3f}**" if not pd.isna(temp_corr) else f"{temp_text}: No data"
-                    st.caption(f"🌡️ {temp_corr_text}")
-            
-            # Forecast Section
-            st.markdown("---")
-            st.header(get_text('forecast_header', lang))
-            
-            # Disclaimer
-            st.warning(f"""
-            {get_text('forecast_warning', lang)}
-            
-            {get_text('forecast_disclaimer', lang)}
-            """)
+            st.markdown(SEROTYPE_LEGEND_HTML, unsafe_allow_html=True)
             
-            # Forecast controls
-            forecast_col1, forecast_col2, forecast_col3 = st.columns([1, 1, 2])
+            render_trends_panel(df_filtered, lang)
             
-            with forecast_col1:
-                forecast_horizon = st.slider(
-                    get_text('forecast_horizon', lang),
-                    min_value=1,
-                    max_value=3,
-                    value=2,
-                    help=get_text('forecast_horizon_help', lang)
-                )
+            render_forecast_panel(filter_key, lang)
             
-            with forecast_col2:
-                forecast_lag = st.selectbox(
-                    get_text('forecast_lag', lang),
-                    options=[1, 2],
-                    help=get_text('forecast_lag_help', lang)
-                )
-            
-            # Generate forecast with caching
-            try:
-                # Get forecast
-                forecast_df = make_forecast(
-                    df_filtered,
-                    horizon_months=forecast_horizon,
-                    rainfall_lag=forecast_lag
-                )
-                
-                # Get backtest metrics
-                metrics = backtest_forecast(
-                    df_filtered,
-                    test_months=min(12, len(df_filtered) // 2),
-                    rainfall_lag=forecast_lag
-                )
-                
-                # Prepare data for visualization
-                last_12_months = df_filtered.tail(12).copy()
-                last_12_months = last_12_months.groupby(last_12_months.index).agg({
-                    'cases': 'sum'
-                })
-                
-                # Create forecast visualization
-                fig_forecast = go.Figure()
-                
-                # Add actual cases
-                actual_label = "Kasus Aktual" if lang == 'id' else "Actual Cases"
-                fig_forecast.add_trace(go.Scatter(
-                    x=last_12_months.index,
-                    y=last_12_months['cases'],
-                    mode='lines+markers',
-                    name=actual_label,
-                    line=dict(color='#2E86AB', width=2),
-                    marker=dict(size=6)
-                ))
-                
-                # Add forecast with confidence interval
-                if len(forecast_df) > 0:
-                    # Add forecast line
-                    forecast_label = "Prakiraan" if lang == 'id' else "Forecast"
-                    fig_forecast.add_trace(go.Scatter(
-                        x=forecast_df['date'],
-                        y=forecast_df['yhat'],
-                        mode='lines+markers',
-                        name=forecast_label,
-                        line=dict(color='#A23B72', width=2, dash='dash'),
-                        marker=dict(size=6)
-                    ))
-                    
-                    # Add confidence interval
-                    x_area = list(forecast_df['date']) + list(forecast_df['date'][::-1])
-                    y_area = list(forecast_df['yhat_upper']) + list(forecast_df['yhat_lower'][::-1])
-                    
-                    interval_label = "Interval Kepercayaan 95%" if lang == 'id' else "95% Confidence Interval"
-                    fig_forecast.add_trace(go.Scatter(
-                        x=x_area,
-                        y=y_area,
-                        fill='toself',
-                        fillcolor='rgba(162, 59, 114, 0.2)',
-                        line=dict(color='rgba(162, 59, 114, 0)'),
-                        name=interval_label,
-                        showlegend=True,
-                        hoverinfo='skip'
-                    ))
-                    
-                    # Connect actual to forecast with a dotted line
-                    if len(last_12_months) > 0 and len(forecast_df) > 0:
-                        fig_forecast.add_trace(go.Scatter(
-                            x=[last_12_months.index[-1], forecast_df['date'].iloc[0]],
-                            y=[last_12_months['cases'].iloc[-1], forecast_df['yhat'].iloc[0]],
-                            mode='lines',
-                            line=dict(color='gray', width=1, dash='dot'),
-                            showlegend=False,
-                            hoverinfo='skip'
-                        ))
-                
-                # Update layout
-                title_text = "Prakiraan Kasus Demam Berdarah" if lang == 'id' else "Dengue Cases Forecast"
-                fig_forecast.update_layout(
-                    title=title_text,
-                    xaxis_title="Tanggal" if lang == 'id' else "Date",
-                    yaxis_title="Kasus" if lang == 'id' else "Cases",
-                    hovermode='x unified',
-                    showlegend=True,
-                    height=400,
-                    plot_bgcolor='white',
-                    paper_bgcolor='white',
-                    xaxis=dict(
-                        gridcolor='#E0E0E0',
-                        showgrid=True,
-                        zeroline=False
-                    ),
-                    yaxis=dict(
-                        gridcolor='#E0E0E0',
-                        showgrid=True,
-                        zeroline=False
-                    )
-                )
-                
-                # Display forecast chart
-                st.plotly_chart(fig_forecast, use_container_width=True)
-                
-                # Accessibility caption for forecast
-                forecast_caption = ("Time series chart showing historical dengue cases and forecasted values with confidence intervals." if lang == 'en' else
-                                  "Grafik seri waktu menunjukkan kasus demam berdarah historis dan nilai prakiraan dengan interval kepercayaan.")
-                st.caption(f"📈 {forecast_caption}")
-                
-                # Display metrics
-                col_metric1, col_metric2, col_metric3 = st.columns(3)
-                
-                with col_metric1:
-                    mae_val = metrics.get('mae', np.nan)
-                    if not pd.isna(mae_val):
-                        st.metric(get_text('mae_backtest', lang), f"{mae_val:.1f} {get_text('cases_unit', lang)}")
-                    else:
-                        st.metric(get_text('mae_backtest', lang), get_text('insufficient_data', lang))
-                
-                with col_metric2:
-                    rmse_val = metrics.get('rmse', np.nan)
-                    if not pd.isna(rmse_val):
-                        st.metric(get_text('rmse_backtest', lang), f"{rmse_val:.1f} {get_text('cases_unit', lang)}")
-                    else:
-                        st.metric(get_text('rmse_backtest', lang), get_text('insufficient_data', lang))
-                
-                with col_metric3:
-                    n_tests = metrics.get('n_tests', 0)
-                    st.metric(get_text('backtest_samples', lang), f"{n_tests} {get_text('months_unit', lang)}")
-                
-                # Model description
-                if len(forecast_df) > 0:
-                    st.info(f"**{get_text('model_label', lang)}** {forecast_df.iloc[0]['model_notes']}")
-                
-            except Exception as e:
-                st.error(f"{get_text('error_forecast', lang)}: {str(e)}")
-                st.info(get_text('limited_data_msg', lang))
-            
-            # Phylogenetics Section
-            st.markdown("---")
-            with st.expander(get_text('phylo_header', lang)):
-                col_phylo1, col_phylo2 = st.columns([1, 2])
-                
-                with col_phylo1:
-                    # Display placeholder image
-                    try:
-                        from PIL import Image
-                        phylo_img_path = Path(__file__).parent.parent / "assets" / "phylo_placeholder.png"
-                        if phylo_img_path.exists():
-                            img = Image.open(phylo_img_path)
-                            caption_text = "Visualisasi Pohon Filogenetik (Placeholder)" if lang == 'id' else "Phylogenetic Tree Visualization (Placeholder)"
-                            st.image(img, caption=caption_text, width='stretch')
-                        else:
-                            st.info("Phylogenetic tree visualization will appear here" if lang == 'en' else 
-                                   "Visualisasi pohon filogenetik akan muncul di sini")
-                    except:
-                        st.info("Phylogenetic tree visualization will appear here" if lang == 'en' else 
-                               "Visualisasi pohon filogenetik akan muncul di sini")
-                
-                with col_phylo2:
-                    st.markdown(f"""
-                    ### {get_text('phylo_pipeline', lang)}
-                    
-                    **{get_text('phylo_coming', lang)}**
-                    
-                    1. **Sequence Alignment** (MAFFT)
-                    2. **Quality Control** (Nextclade)
-                    3. **Tree Construction** (IQ-TREE)
-                    4. **Temporal Analysis** (TreeTime)
-                    5. **Visualization** (Nextstrain/Auspice)
-                    """)
-                
-                st.markdown("---")
-                
-                # Auspice JSON uploader
-                st.markdown(f"### {get_text('auspice_preview', lang)}")
-                st.markdown(get_text('auspice_desc', lang))
-                
-                uploaded_file = st.file_uploader(
-                    get_text('choose_file', lang),
-                    type=['json'],
-                    key='auspice_upload',
-                    help="Upload a Nextstrain Auspice JSON for basic metadata preview"
-                )
-                
-                if uploaded_file is not None:
-                    try:
-                        import tempfile
-                        import os
-                        
-                        json_content = json.loads(uploaded_file.read())
-                        
-                        # Save to temp file
-                        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as tmp_file:
-                            json.dump(json_content, tmp_file)
-                            temp_path = tmp_file.name
-                        
-                        st.success(get_text('file_uploaded', lang))
-                        
-                        # Extract basic metadata
-                        metadata = {}
-                        
-                        # Check for tree structure
-                        if 'tree' in json_content:
-                            def count_nodes(node):
-                                count = 1
-                                if 'children' in node:
-                                    for child in node['children']:
-                                        count += count_nodes(child)
-                                return count
-                            
-                            metadata['Total nodes'] = count_nodes(json_content['tree'])
-                        
-                        # Display metadata
-                        if metadata:
-                            st.markdown(f"**{get_text('file_metadata', lang)}**")
-                            for key, value in metadata.items():
-                                st.write(f"- {key}: {value}")
-                        
-                    except json.JSONDecodeError:
-                        st.error("Invalid JSON file" if lang == 'en' else "File JSON tidak valid")
-                    except Exception as e:
-                        st.error(f"Error: {str(e)}")
+            render_phylo_panel(lang)
             
         else:
             st.warning("No data available" if lang == 'en' else "Tidak ada data tersedia")
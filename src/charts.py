@@ -101,6 +101,28 @@ def create_serotype_stacked_area(df: pd.DataFrame,
     return fig
 
 
+def pearson_corr(x: np.ndarray, y: np.ndarray) -> float:
+    """
+    Pearson correlation over the positions where both arrays are non-null.
+    
+    Args:
+        x: First array
+        y: Second array of the same length
+        
+    Returns:
+        Correlation coefficient, 0.0 if fewer than two valid pairs, or NaN
+        if either side is constant
+    """
+    valid = ~(np.isnan(x) | np.isnan(y))
+    if valid.sum() < 2:
+        return 0.0
+    
+    x = x[valid] - x[valid].mean()
+    y = y[valid] - y[valid].mean()
+    denom = np.sqrt((x @ x) * (y @ y))
+    return float(x @ y / denom) if denom > 0 else np.nan
+
+
 def create_cases_climate_dual_axis(df: pd.DataFrame,
                                    lag_months: int = 0) -> tuple[go.Figure, float, float]:
     """
@@ -123,19 +145,10 @@ def create_cases_climate_dual_axis(df: pd.DataFrame,
     # Apply lag to rainfall
     rainfall_lagged = monthly['rainfall_mm'].shift(lag_months)
     
-    # Calculate correlations
-    rainfall_corr = 0.0
-    temp_corr = 0.0
-    
-    if len(monthly) > 1:
-        # Only calculate where we have non-null values after lag
-        valid_mask = rainfall_lagged.notna() & monthly['cases'].notna()
-        if valid_mask.sum() > 1:
-            rainfall_corr = monthly['cases'][valid_mask].corr(rainfall_lagged[valid_mask])
-        
-        temp_mask = monthly['temperature_c'].notna() & monthly['cases'].notna()
-        if temp_mask.sum() > 1:
-            temp_corr = monthly['cases'][temp_mask].corr(monthly['temperature_c'])
+    # Calculate correlations on the raw arrays (no index alignment needed)
+    cases = monthly['cases'].to_numpy(dtype=float)
+    rainfall_corr = pearson_corr(cases, rainfall_lagged.to_numpy(dtype=float))
+    temp_corr = pearson_corr(cases, monthly['temperature_c'].to_numpy(dtype=float))
     
     # Create figure with secondary y-axis
     fig = go.Figure()
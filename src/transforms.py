@@ -10,6 +10,8 @@ import streamlit as st
 from typing import Optional, List, Union, Dict, Tuple
 from pathlib import Path
 import json
+import os
+import tempfile
 
 # Handle optional geopandas import for cloud deployment
 try:
@@ -19,6 +21,13 @@ except ImportError:
     GEOPANDAS_AVAILABLE = False
     print("GeoPandas not available - using simplified features")
 
+# Prefer the pyogrio IO engine (much faster than Fiona) when it is installed
+try:
+    import pyogrio
+    GEO_IO_ENGINE = "pyogrio"
+except ImportError:
+    GEO_IO_ENGINE = None
+
 
 # Color palette for serotypes
 SEROTYPE_PALETTE = {
@@ -28,22 +37,34 @@ SEROTYPE_PALETTE = {
     'DENV4': '#96CEB4'   # Green
 }
 
+ALL_SEROTYPES = tuple(SEROTYPE_PALETTE)
 
-@st.cache_data(ttl=3600)
+# Categorical dtype for dominant_serotype ('No Data' marks provinces without a row)
+SEROTYPE_DTYPE = pd.CategoricalDtype(categories=[*ALL_SEROTYPES, 'No Data'])
+
+# Simplification tolerance (degrees) for geometries drawn in the browser
+GEO_SIMPLIFY_TOLERANCE = 0.01
+
+# Province GeoJSON published for Streamlit static serving (app/static -> /app/static/)
+STATIC_GEOJSON_PATH = Path(__file__).parent.parent / "app" / "static" / "provinces.geojson"
+STATIC_GEOJSON_URL = "app/static/provinces.geojson"
+
+
+@st.cache_resource(ttl=3600)
 def load_geo():
     """
     Load provinces GeoJSON. Falls back to simplified data if GeoPandas unavailable.
-    Cached for 1 hour.
+    Cached for 1 hour as a shared resource (geometries are not pickled per rerun).
     
     Returns:
-        DataFrame or GeoDataFrame: Provinces with geometry and metadata
+        DataFrame or GeoDataFrame: Provinces with geometry and metadata, indexed by province_id
     """
     # Get path to mock data
     data_path = Path(__file__).parent.parent / "data" / "mock" / "provinces.geojson"
     
     if GEOPANDAS_AVAILABLE:
         # Load as GeoDataFrame when geopandas is available
-        gdf = gpd.read_file(str(data_path))
+        gdf = gpd.read_file(str(data_path), engine=GEO_IO_ENGINE)
         
         # Ensure correct dtypes
         gdf['province_id'] = gdf['province_id'].astype(str)
@@ -56,7 +77,8 @@ def load_geo():
         assert gdf['province_id'].notna().all(), "Missing province_id values"
         assert gdf['province_name'].notna().all(), "Missing province_name values"
         
-        return gdf
+        # Index by province_id so per-rerun lookups are hash lookups
+        return gdf.set_index('province_id', drop=False).rename_axis(None)
     else:
         # Fallback: Create a simple DataFrame with province data
         provinces_data = {
@@ -73,7 +95,7 @@ def load_geo():
         df['lon'] = df['lon'].astype(float)
         df['lat'] = df['lat'].astype(float)
         
-        return df
+        return df.set_index('province_id', drop=False).rename_axis(None)
 
 
 @st.cache_data(ttl=3600)
@@ -98,13 +120,16 @@ def load_features() -> pd.DataFrame:
     # Don't force freq='MS' as it may not match the actual data spacing
     # Just ensure it's a DatetimeIndex
     df.index = pd.DatetimeIndex(df.index)
+    # Sorted once here, so every filtered frame keeps a monotonic index
+    df = df.sort_index(kind='stable')
     
     # Ensure correct dtypes
-    df['province_id'] = df['province_id'].astype(str)
+    # Categorical keys make the per-rerun filters, merges and groupbys cheaper
+    df['province_id'] = df['province_id'].astype(str).astype('category')
     df['cases'] = df['cases'].astype(int)
     df['rainfall_mm'] = df['rainfall_mm'].astype(float)
     df['temperature_c'] = df['temperature_c'].astype(float)
-    df['dominant_serotype'] = df['dominant_serotype'].astype(str)
+    df['dominant_serotype'] = df['dominant_serotype'].astype(str).astype(SEROTYPE_DTYPE)
     
     # Serotype shares as float
     for col in ['denv1_share', 'denv2_share', 'denv3_share', 'denv4_share']:
@@ -126,6 +151,145 @@ def load_features() -> pd.DataFrame:
     return df
 
 
+@st.cache_resource(ttl=3600)
+def load_geo_simplified():
+    """
+    Load provinces with display-resolution geometries for map rendering.
+    Topology-preserving simplification shrinks the GeoJSON sent to Plotly.
+    Cached for 1 hour as a shared resource.
+    
+    Returns:
+        DataFrame or GeoDataFrame: Provinces with simplified geometry
+    """
+    gdf = load_geo()
+    
+    if not GEOPANDAS_AVAILABLE:
+        return gdf
+    
+    gdf = gdf.copy()
+    gdf['geometry'] = gdf.geometry.simplify(GEO_SIMPLIFY_TOLERANCE, preserve_topology=True)
+    return gdf
+
+
+@st.cache_resource(ttl=3600)
+def load_centroids() -> Tuple[Dict[str, int], np.ndarray]:
+    """
+    Province centroids as a compact lookup for the bubble map.
+    Cached for 1 hour as a shared resource.
+    
+    Returns:
+        Tuple of (row position by province_id, float32 array of shape (n, 2) with lon/lat)
+    """
+    gdf = load_geo()
+    positions = {province_id: i for i, province_id in enumerate(gdf['province_id'])}
+    return positions, gdf[['lon', 'lat']].to_numpy(dtype=np.float32)
+
+
+@st.cache_resource(ttl=3600)
+def has_province_geometry() -> bool:
+    """
+    Whether the provinces carry polygons (False for the no-GeoPandas fallback).
+    Cached for 1 hour as a shared resource.
+    
+    Returns:
+        bool: True if at least one province has a geometry
+    """
+    gdf = load_geo()
+    return 'geometry' in gdf.columns and bool(gdf['geometry'].notna().any())
+
+
+@st.cache_data(ttl=3600)
+def list_provinces() -> List[str]:
+    """
+    Sorted province IDs present in the features data.
+    Cached for 1 hour.
+    
+    Returns:
+        List[str]: Province IDs
+    """
+    return sorted(load_features()['province_id'].unique())
+
+
+@st.cache_data(ttl=3600)
+def year_bounds() -> Tuple[int, int]:
+    """
+    First and last year in the features data.
+    Cached for 1 hour.
+    
+    Returns:
+        Tuple of (min_year, max_year)
+    """
+    dates = load_features().index
+    return int(dates.min().year), int(dates.max().year)
+
+
+@st.cache_resource(ttl=3600)
+def load_full_geojson() -> Dict:
+    """
+    Serialize all provinces to a GeoJSON dict once.
+    Only province_id is kept as a property, since that is all the maps key on.
+    Cached for 1 hour as a shared resource - treat it as read-only.
+    
+    Returns:
+        Dict: GeoJSON FeatureCollection for every province
+    """
+    return json.loads(load_geo_simplified()[['province_id', 'geometry']].to_json(drop_id=True))
+
+
+@st.cache_resource
+def publish_geojson() -> Optional[str]:
+    """
+    Write the simplified province GeoJSON into the app's static folder once,
+    so figures can reference it by URL and the browser caches the shapes.
+    Cached for the life of the process (no TTL), since the file is served
+    while it exists; it is swapped in atomically and left alone if unchanged.
+    
+    Returns:
+        Optional[str]: URL of the served file, or None if static serving is
+        disabled or the file can't be written
+    """
+    if not st.get_option('server.enableStaticServing'):
+        return None
+    
+    content = json.dumps(load_full_geojson()).encode('utf-8')
+    tmp_path = None
+    try:
+        if STATIC_GEOJSON_PATH.exists() and STATIC_GEOJSON_PATH.read_bytes() == content:
+            return STATIC_GEOJSON_URL
+        
+        STATIC_GEOJSON_PATH.parent.mkdir(exist_ok=True)
+        # Write next to the target, then rename over it, so a browser fetching
+        # the file never sees a partial write
+        fd, tmp_path = tempfile.mkstemp(dir=STATIC_GEOJSON_PATH.parent, prefix='.provinces-', suffix='.tmp')
+        with os.fdopen(fd, 'wb') as tmp_file:
+            tmp_file.write(content)
+        os.replace(tmp_path, STATIC_GEOJSON_PATH)
+    except OSError:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return None
+    
+    return STATIC_GEOJSON_URL
+
+
+def load_geojson(province_ids) -> Dict:
+    """
+    Slice the cached GeoJSON down to the selected provinces.
+    
+    Args:
+        province_ids: Iterable of province IDs to keep
+        
+    Returns:
+        Dict: GeoJSON FeatureCollection sharing features with the cached dict
+    """
+    selected = set(province_ids)
+    full = load_full_geojson()
+    return {
+        "type": "FeatureCollection",
+        "features": [f for f in full["features"] if f["properties"]["province_id"] in selected]
+    }
+
+
 def compute_dominant_serotype(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, str]]:
     """
     Add dominant_serotype column and return palette mapping.
@@ -145,15 +309,16 @@ def compute_dominant_serotype(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str,
     if not all(col in df.columns for col in serotype_cols):
         raise ValueError(f"Missing serotype columns. Expected: {serotype_cols}")
     
-    # Find dominant serotype (argmax)
-    dominant_idx = df[serotype_cols].values.argmax(axis=1)
-    df['dominant_serotype'] = ['DENV' + str(i+1) for i in dominant_idx]
+    # Find dominant serotype (argmax); share columns follow ALL_SEROTYPES order,
+    # so the argmax is already the category code
+    dominant_idx = df[serotype_cols].to_numpy().argmax(axis=1)
+    df['dominant_serotype'] = pd.Categorical.from_codes(dominant_idx, dtype=SEROTYPE_DTYPE)
     
     # Return dataframe and palette
     return df, SEROTYPE_PALETTE
 
 
-@st.cache_data(ttl=3600)
+@st.cache_data(ttl=3600, max_entries=64)
 def build_province_month_df(
     province: Optional[Union[str, List[str]]] = None,
     year_range: Optional[Tuple[int, int]] = None,
@@ -161,7 +326,7 @@ def build_province_month_df(
 ) -> pd.DataFrame:
     """
     Build a filtered tidy dataframe based on province, year range, and serotypes.
-    Cached for 1 hour.
+    Cached for 1 hour, keeping at most 64 filter combinations.
     
     Args:
         province: Single province ID, list of IDs, or None for all
@@ -198,6 +198,26 @@ TRANSLATIONS = {
     }
 }
 
+# Province display names per language
+PROVINCE_NAMES = {
+    'en': {
+        'DKI': 'DKI Jakarta',
+        'JABAR': 'West Java',
+        'JATENG': 'Central Java',
+        'JATIM': 'East Java',
+        'BANTEN': 'Banten',
+        'DIY': 'Yogyakarta'
+    },
+    'id': {
+        'DKI': 'DKI Jakarta',
+        'JABAR': 'Jawa Barat',
+        'JATENG': 'Jawa Tengah',
+        'JATIM': 'Jawa Timur',
+        'BANTEN': 'Banten',
+        'DIY': 'DI Yogyakarta'
+    }
+}
+
 def get_text(key: str, language: str = 'en') -> str:
     """
     Get translated text for a given key.
@@ -222,23 +242,4 @@ def get_province_name(province_id: str, language: str = 'en') -> str:
     Returns:
         Translated province name
     """
-    province_names = {
-        'en': {
-            'DKI': 'DKI Jakarta',
-            'JABAR': 'West Java',
-            'JATENG': 'Central Java',
-            'JATIM': 'East Java',
-            'BANTEN': 'Banten',
-            'DIY': 'Yogyakarta'
-        },
-        'id': {
-            'DKI': 'DKI Jakarta',
-            'JABAR': 'Jawa Barat',
-            'JATENG': 'Jawa Tengah',
-            'JATIM': 'Jawa Timur',
-            'BANTEN': 'Banten',
-            'DIY': 'DI Yogyakarta'
-        }
-    }
-    
-    return province_names.get(language, {}).get(province_id, province_id)
\ No newline at end of file
+    return PROVINCE_NAMES.get(language, {}).get(province_id, province_id)
\ No newline at end of file